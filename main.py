@@ -1,17 +1,18 @@
 import array
 import os
 import random
-import string
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Generator
-from uuid import uuid4
+from uuid import UUID
 
-import psycopg2
+import psycopg
 import pytest
-import ulid
+from psycopg import sql
+from psycopg_pool import ConnectionPool
 from pytest_docker_tools import container, fetch
 from pytest_docker_tools.wrappers import Container
-from uuid_extensions import uuid7
+from ulid_transform import ulid_now, ulid_to_bytes
 
 POSTGRES_DB = "testdb"
 POSTGRES_USER = "user"
@@ -20,6 +21,10 @@ POSTGRES_PASSWORD = "password"
 # Number of inserts to perform in the test, read from ENV if set otherwise default to 10
 INSERT_COUNT = int(os.getenv("INSERT_COUNT", 100))
 SELECT_COUNT = int(os.getenv("SELECT_COUNT", 10))
+# Rounds per benchmark; each round gets fresh tables and fresh rows
+BENCHMARK_ROUNDS = int(os.getenv("BENCHMARK_ROUNDS", 10))
+# Rows moved per fetchmany batch when draining the probe cursor
+PROBE_BATCH_SIZE = int(os.getenv("PROBE_BATCH_SIZE", 500))
 postgres_image = fetch(repository="postgres:latest")  # type: ignore
 
 postgres_container: Container = container(
@@ -37,24 +42,32 @@ postgres_container: Container = container(
 
 
 class SlidingSample:
-    def __init__(self, size) -> None:
+    # Uniform reservoir sample (algorithm R) over a preallocated buffer;
+    # a typecode packs fixed-width items contiguously instead of boxing
+    # them in a list (8 bytes per serial id instead of a PyObject each)
+    def __init__(self, size, typecode=None) -> None:
         self.size = size
-        self.data = list()
+        if typecode is None:
+            self.data = [None] * size
+        else:
+            self.data = array.array(typecode, [0] * size)
+        self.n = 0
+        self._rng = random.Random()
 
     def append(self, item):
-        if len(self.data) < self.size:
-            self.data.append(item)
-        elif random.random() > 0.5:
-            index = int(random.random() * self.size)
-            self.data[index] = item
-
-        pass
+        self.n += 1
+        if self.n <= self.size:
+            self.data[self.n - 1] = item
+        else:
+            index = self._rng.randrange(self.n)
+            if index < self.size:
+                self.data[index] = item
 
     def __len__(self):
-        return len(self.data)
+        return min(self.n, self.size)
 
     def __iter__(self):
-        return iter(self.data)
+        return iter(self.data[: len(self)])
 
 
 @pytest.fixture
@@ -68,7 +81,95 @@ def postgres_url(postgres_container: Container) -> str:
 
 
 def generate_random_string():
-    return "".join(random.choices(string.ascii_lowercase + string.digits, k=10))
+    # 10 lowercase hex chars; os.urandom + hex() runs in C instead of
+    # looping over random.choices in bytecode
+    return os.urandom(5).hex()
+
+
+# Payload strings are pure noise in a DB-bound benchmark, so draw them
+# from a fixed pool instead of generating one per row
+_STRING_POOL = tuple(generate_random_string() for _ in range(1024))
+
+
+def bulk_uuid4(n):
+    # Slice n ids out of one urandom slab, then set the version and
+    # variant bits per RFC 4122
+    buf = os.urandom(16 * n)
+    ids = []
+    for i in range(n):
+        chunk = bytearray(buf[i * 16 : (i + 1) * 16])
+        chunk[6] = (chunk[6] & 0x0F) | 0x40
+        chunk[8] = (chunk[8] & 0x3F) | 0x80
+        ids.append(UUID(bytes=bytes(chunk)))
+    return ids
+
+
+def bulk_uuid7(n):
+    # 48-bit millisecond timestamp plus a random tail from one urandom
+    # slab, version 7 with the RFC variant
+    timestamp = int(time.time() * 1000).to_bytes(6, "big")
+    buf = os.urandom(10 * n)
+    ids = []
+    for i in range(n):
+        chunk = bytearray(timestamp + buf[i * 10 : (i + 1) * 10])
+        chunk[6] = (chunk[6] & 0x0F) | 0x70
+        chunk[8] = (chunk[8] & 0x3F) | 0x80
+        ids.append(UUID(bytes=bytes(chunk)))
+    return ids
+
+
+def bulk_ulid(n):
+    # ulid-transform generates and decodes in C; no batch API, so the
+    # per-id calls are simply hoisted out of the hot loop
+    return [ulid_to_bytes(ulid_now()) for _ in range(n)]
+
+
+@pytest.fixture
+def db(postgres_url: str) -> Generator[tuple[psycopg.Connection, psycopg.Cursor], None, None]:
+    conn = psycopg.connect(postgres_url, prepare_threshold=1)
+    cur = conn.cursor()
+
+    yield conn, cur
+
+    cur.close()
+    conn.close()
+
+
+@pytest.fixture(params=[1, 4, 8])
+def workers(request) -> int:
+    return request.param
+
+
+@pytest.fixture(params=["insertion", "sorted", "shuffled"])
+def probe_order(request) -> str:
+    return request.param
+
+
+def order_probe_ids(ids, probe_order):
+    # Controls B-tree access locality: sorted probes walk the index in
+    # key order, shuffled probes jump across it, insertion keeps the
+    # arrival order of the sample
+    ids = list(ids)
+    if probe_order == "sorted":
+        ids.sort()
+    elif probe_order == "shuffled":
+        random.shuffle(ids)
+    return ids
+
+
+@pytest.fixture
+def pool(postgres_url: str, workers: int) -> Generator[ConnectionPool, None, None]:
+    pool = ConnectionPool(
+        postgres_url,
+        min_size=workers,
+        max_size=workers,
+        kwargs={"prepare_threshold": 1},
+    )
+    pool.wait()
+
+    yield pool
+
+    pool.close()
 
 
 @pytest.fixture(autouse=True)
@@ -76,7 +177,7 @@ def cleanup(postgres_url: str) -> Generator[None, None, None]:
     # Run test
     yield
 
-    conn = psycopg2.connect(postgres_url)
+    conn = psycopg.connect(postgres_url)
     cur = conn.cursor()
     cur.execute("DROP TABLE IF EXISTS child;")
     cur.execute("DROP TABLE IF EXISTS parent;")
@@ -85,364 +186,546 @@ def cleanup(postgres_url: str) -> Generator[None, None, None]:
     conn.close()
 
 
-def create_tables_with_serial_pk(conn, cur):
-    cur.execute("CREATE TABLE parent (id serial PRIMARY KEY, data text);")
+def create_tables(conn, cur, pk_type, ref_type=None, pk_default=""):
+    # One shared DDL template keeps the table shape identical across
+    # benchmarks by construction; the pinned fillfactor makes page-split
+    # behavior a property of the key type, not of storage parameters
+    ref_type = ref_type or pk_type
     cur.execute(
-        "CREATE TABLE child (id serial PRIMARY KEY, parent_id int REFERENCES parent(id), data text);"
+        sql.SQL(
+            "CREATE TABLE parent "
+            "(id {pk_type} {pk_default} PRIMARY KEY WITH (fillfactor = 90), "
+            "data text);"
+        ).format(pk_type=sql.SQL(pk_type), pk_default=sql.SQL(pk_default))
     )
-    conn.commit()
-
-
-def create_tables_with_bytea_ulid_pk(conn, cur):
-    cur.execute("CREATE TABLE parent (id BYTEA PRIMARY KEY, data text);")
     cur.execute(
-        "CREATE TABLE child (id BYTEA PRIMARY KEY, parent_id BYTEA REFERENCES parent(id), data text);"
+        sql.SQL(
+            "CREATE TABLE child "
+            "(id {pk_type} {pk_default} PRIMARY KEY WITH (fillfactor = 90), "
+            "parent_id {ref_type} REFERENCES parent(id), data text);"
+        ).format(
+            pk_type=sql.SQL(pk_type),
+            pk_default=sql.SQL(pk_default),
+            ref_type=sql.SQL(ref_type),
+        )
     )
     conn.commit()
 
 
-def create_tables_with_uuidv7_pk(conn, cur):
-    cur.execute("CREATE TABLE parent (id UUID PRIMARY KEY, data text);")
-    cur.execute(
-        "CREATE TABLE child (id UUID PRIMARY KEY, parent_id UUID REFERENCES parent(id), data text);"
-    )
+def truncate_tables(conn, cur):
+    cur.execute("TRUNCATE child, parent;")
     conn.commit()
 
 
-def create_tables_with_uuidv4_pk(conn, cur):
-    cur.execute("CREATE TABLE parent (id UUID PRIMARY KEY, data text);")
-    cur.execute(
-        "CREATE TABLE child (id UUID PRIMARY KEY, parent_id UUID REFERENCES parent(id), data text);"
-    )
-    conn.commit()
+def mogrify_values(conn, template, rows):
+    # Render rows into one VALUES list client-side; escaping still goes
+    # through psycopg's ClientCursor, so the SQL stays injection-safe
+    with psycopg.ClientCursor(conn) as mog:
+        return ",".join(mog.mogrify(template, row) for row in rows)
 
 
 @pytest.mark.benchmark(
     group="insert",
 )
-def test_serial_pk_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_serial_pk(conn, cur)
-
-    ids = SlidingSample(SELECT_COUNT)
-
-    # Benchmark the insert
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            ids.append(i)
-            cur.execute(
-                f"INSERT INTO parent (data) VALUES ('{generate_random_string()}');"
-            )
+def test_serial_pk_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "serial", ref_type="int")
+
+    # Row generation happens in setup so the timer only sees DB work
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        with cur.copy("COPY parent (data) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
         conn.commit()
 
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="select",
 )
-def test_serial_pk_select(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
+def test_serial_pk_select(benchmark, db, probe_order) -> None:
+    conn, cur = db
 
-    create_tables_with_serial_pk(conn, cur)
+    create_tables(conn, cur, "serial", ref_type="int")
 
-    ids = SlidingSample(SELECT_COUNT)
+    ids = SlidingSample(SELECT_COUNT, "Q")
 
-    for i in range(INSERT_COUNT):
-        cur.execute(
-            f"INSERT INTO parent (data) VALUES ('{generate_random_string()}') RETURNING id;"
-        )
-        ids.append(cur.fetchone()[0])  # type: ignore
+    rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+    values = mogrify_values(conn, "(%s)", rows)
+    cur.execute("INSERT INTO parent (data) VALUES " + values + " RETURNING id;")
+    for (id,) in cur.fetchall():
+        ids.append(id)
 
     conn.commit()
 
+    probe_ids = order_probe_ids(ids, probe_order)
+
+    # One untimed probe warms the index and heap pages in shared_buffers
+    cur.execute("SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,))
+    cur.fetchall()
+
     @benchmark
     def select():
-        result = []
-        for id in ids:
-            cur.execute(f"SELECT * FROM parent WHERE id = {id};")
-            result.append(cur.fetchall())
-        conn.commit()
-        return result
+        # A named cursor keeps the result set server-side and streams
+        # it over in bounded fetchmany batches
+        with conn.cursor(name="probe") as server_cur:
+            server_cur.itersize = PROBE_BATCH_SIZE
+            server_cur.execute(
+                "SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,)
+            )
+            rows = []
+            while batch := server_cur.fetchmany(PROBE_BATCH_SIZE):
+                rows.extend(batch)
+        return rows
 
     assert len(select) == SELECT_COUNT  # type: ignore
 
-    cur.close()
-    conn.close()
-
 
 @pytest.mark.benchmark(group="relation")
-def test_serial_pk_parent_child_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_serial_pk(conn, cur)
-
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            cur.execute(
-                f"INSERT INTO parent (data) VALUES ('{generate_random_string()}') RETURNING id;"
-            )
-            parent_id = cur.fetchone()[0]  # type: ignore
-            cur.execute(
-                f"INSERT INTO child (parent_id, data) VALUES ({parent_id}, '{generate_random_string()}');"
-            )
+def test_serial_pk_parent_child_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "serial", ref_type="int")
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [
+            (_STRING_POOL[i & 1023], _STRING_POOL[i & 1023])
+            for i in range(INSERT_COUNT)
+        ]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        cur.executemany(
+            "WITH p AS (INSERT INTO parent (data) VALUES (%s) RETURNING id) "
+            "INSERT INTO child (parent_id, data) SELECT id, %s FROM p;",
+            rows,
+        )
         conn.commit()
 
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="insert",
 )
-def test_bytea_ulid_pk_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_bytea_ulid_pk(conn, cur)
-
-    # Benchmark the insert
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{ulid.ulid()}','{generate_random_string()}');"
-            )
+def test_bytea_ulid_pk_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "BYTEA")
+
+    # Row generation happens in setup so the timer only sees DB work
+    def setup():
+        truncate_tables(conn, cur)
+        new_ids = bulk_ulid(INSERT_COUNT)
+        rows = [(new_ids[i], _STRING_POOL[i & 1023]) for i in range(INSERT_COUNT)]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        with cur.copy("COPY parent (id, data) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
         conn.commit()
 
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="select",
 )
-def test_bytea_ulid_pk_select(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
+def test_bytea_ulid_pk_select(benchmark, db, probe_order) -> None:
+    conn, cur = db
 
-    create_tables_with_bytea_ulid_pk(conn, cur)
+    create_tables(conn, cur, "BYTEA")
 
     ids = SlidingSample(SELECT_COUNT)
 
-    for i in range(INSERT_COUNT):
-        id = ulid.ulid()
-        cur.execute(
-            f"INSERT INTO parent (id, data) VALUES ('{id}','{generate_random_string()}');"
-        )
+    new_ids = bulk_ulid(INSERT_COUNT)
+    rows = [(new_ids[i], _STRING_POOL[i & 1023]) for i in range(INSERT_COUNT)]
+    values = mogrify_values(conn, "(%s, %s)", rows)
+    cur.execute("INSERT INTO parent (id, data) VALUES " + values + ";")
+    for id, _ in rows:
         ids.append(id)
 
     conn.commit()
 
+    probe_ids = order_probe_ids(ids, probe_order)
+
+    # One untimed probe warms the index and heap pages in shared_buffers
+    cur.execute("SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,))
+    cur.fetchall()
+
     @benchmark
     def select():
-        result = []
-        for id in ids:
-            cur.execute(f"SELECT * FROM parent WHERE id = '{id}';")
-            result.append(cur.fetchall())
-        conn.commit()
-        return result
+        # A named cursor keeps the result set server-side and streams
+        # it over in bounded fetchmany batches
+        with conn.cursor(name="probe") as server_cur:
+            server_cur.itersize = PROBE_BATCH_SIZE
+            server_cur.execute(
+                "SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,)
+            )
+            rows = []
+            while batch := server_cur.fetchmany(PROBE_BATCH_SIZE):
+                rows.extend(batch)
+        return rows
 
     assert len(select) == SELECT_COUNT  # type: ignore
 
-    cur.close()
-    conn.close()
-
 
 @pytest.mark.benchmark(group="relation")
-def test_bytea_ulid_pk_parent_child_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_bytea_ulid_pk(conn, cur)
-
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            parent_id = ulid.ulid()
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{parent_id}', '{generate_random_string()}');"
-            )
-            child_id = ulid.ulid()
-            cur.execute(
-                f"INSERT INTO child (id, parent_id, data) VALUES ('{child_id}', '{parent_id}', '{generate_random_string()}');",
-            )
+def test_bytea_ulid_pk_parent_child_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "BYTEA")
+
+    def setup():
+        truncate_tables(conn, cur)
+        new_ids = bulk_ulid(INSERT_COUNT)
+        child_ids = bulk_ulid(INSERT_COUNT)
+        rows = [
+            (new_ids[i], _STRING_POOL[i & 1023], child_ids[i], _STRING_POOL[i & 1023])
+            for i in range(INSERT_COUNT)
+        ]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        cur.executemany(
+            "WITH p AS (INSERT INTO parent (id, data) VALUES (%s, %s) RETURNING id) "
+            "INSERT INTO child (id, parent_id, data) SELECT %s, id, %s FROM p;",
+            rows,
+        )
         conn.commit()
 
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="insert",
 )
-def test_uuid_uuidv7_pk_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_uuidv7_pk(conn, cur)
-
-    # Benchmark the insert
-    @benchmark
-    def result():
-        for i in range(INSERT_COUNT):
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{uuid7(as_type='str')}','{generate_random_string()}');"
-            )
+def test_uuid_uuidv7_pk_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT uuidv7()")
+
+    # Row generation happens in setup so the timer only sees DB work
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        with cur.copy("COPY parent (data) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
         conn.commit()
 
-    cur.execute("SELECT * FROM parent lIMIT 10;")
-    x = cur.fetchall()  # type: ignore
-    print(x)
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="select",
 )
-def test_uuid_uuidv7_pk_select(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
+def test_uuid_uuidv7_pk_select(benchmark, db, probe_order) -> None:
+    conn, cur = db
 
-    create_tables_with_uuidv7_pk(conn, cur)
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT uuidv7()")
 
     ids = SlidingSample(SELECT_COUNT)
 
-    for i in range(INSERT_COUNT):
-        id = uuid7(as_type="str")
-        cur.execute(
-            f"INSERT INTO parent (id, data) VALUES ('{id}','{generate_random_string()}');"
-        )
+    new_ids = bulk_uuid7(INSERT_COUNT)
+    rows = [(new_ids[i], _STRING_POOL[i & 1023]) for i in range(INSERT_COUNT)]
+    values = mogrify_values(conn, "(%s, %s)", rows)
+    cur.execute("INSERT INTO parent (id, data) VALUES " + values + ";")
+    for id, _ in rows:
         ids.append(id)
 
     conn.commit()
 
+    probe_ids = order_probe_ids(ids, probe_order)
+
+    # One untimed probe warms the index and heap pages in shared_buffers
+    cur.execute("SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,))
+    cur.fetchall()
+
     @benchmark
     def select():
-        result = []
-        for id in ids:
-            cur.execute(f"SELECT * FROM parent WHERE id = '{id}';")
-            result.append(cur.fetchall())
-        conn.commit()
-        return result
+        # A named cursor keeps the result set server-side and streams
+        # it over in bounded fetchmany batches
+        with conn.cursor(name="probe") as server_cur:
+            server_cur.itersize = PROBE_BATCH_SIZE
+            server_cur.execute(
+                "SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,)
+            )
+            rows = []
+            while batch := server_cur.fetchmany(PROBE_BATCH_SIZE):
+                rows.extend(batch)
+        return rows
 
     assert len(select) == SELECT_COUNT  # type: ignore
 
-    cur.close()
-    conn.close()
-
 
 @pytest.mark.benchmark(group="relation")
-def test_uuidv7_pk_parent_child_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_uuidv7_pk(conn, cur)
-
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            parent_id = uuid7(as_type="str")
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{parent_id}', '{generate_random_string()}');"
-            )
-            child_id = uuid7(as_type="str")
-            cur.execute(
-                f"INSERT INTO child (id, parent_id, data) VALUES ('{child_id}', '{parent_id}', '{generate_random_string()}');",
-            )
+def test_uuidv7_pk_parent_child_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT uuidv7()")
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [
+            (_STRING_POOL[i & 1023], _STRING_POOL[i & 1023])
+            for i in range(INSERT_COUNT)
+        ]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        cur.executemany(
+            "WITH p AS (INSERT INTO parent (data) VALUES (%s) RETURNING id) "
+            "INSERT INTO child (parent_id, data) SELECT id, %s FROM p;",
+            rows,
+        )
         conn.commit()
 
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="insert",
 )
-def test_uuid_uuidv4_pk_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
-
-    create_tables_with_uuidv4_pk(conn, cur)
-
-    # Benchmark the insert
-    @benchmark
-    def result():
-        for i in range(INSERT_COUNT):
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{str(uuid4())}','{generate_random_string()}');"
-            )
+def test_uuid_uuidv4_pk_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT gen_random_uuid()")
+
+    # Row generation happens in setup so the timer only sees DB work
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        with cur.copy("COPY parent (data) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
         conn.commit()
 
-    cur.execute("SELECT * FROM parent lIMIT 10;")
-    x = cur.fetchall()  # type: ignore
-    print(x)
-    cur.close()
-    conn.close()
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
 
 @pytest.mark.benchmark(
     group="select",
 )
-def test_uuid_uuidv4_pk_select(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
+def test_uuid_uuidv4_pk_select(benchmark, db, probe_order) -> None:
+    conn, cur = db
 
-    create_tables_with_uuidv4_pk(conn, cur)
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT gen_random_uuid()")
 
     ids = SlidingSample(SELECT_COUNT)
 
-    for i in range(INSERT_COUNT):
-        id = str(uuid4())
-        cur.execute(
-            f"INSERT INTO parent (id, data) VALUES ('{id}','{generate_random_string()}');"
-        )
+    new_ids = bulk_uuid4(INSERT_COUNT)
+    rows = [(new_ids[i], _STRING_POOL[i & 1023]) for i in range(INSERT_COUNT)]
+    values = mogrify_values(conn, "(%s, %s)", rows)
+    cur.execute("INSERT INTO parent (id, data) VALUES " + values + ";")
+    for id, _ in rows:
         ids.append(id)
 
     conn.commit()
 
+    probe_ids = order_probe_ids(ids, probe_order)
+
+    # One untimed probe warms the index and heap pages in shared_buffers
+    cur.execute("SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,))
+    cur.fetchall()
+
     @benchmark
     def select():
-        result = []
-        for id in ids:
-            cur.execute(f"SELECT * FROM parent WHERE id = '{id}';")
-            result.append(cur.fetchall())
-        conn.commit()
-        return result
+        # A named cursor keeps the result set server-side and streams
+        # it over in bounded fetchmany batches
+        with conn.cursor(name="probe") as server_cur:
+            server_cur.itersize = PROBE_BATCH_SIZE
+            server_cur.execute(
+                "SELECT * FROM parent WHERE id = ANY(%s);", (probe_ids,)
+            )
+            rows = []
+            while batch := server_cur.fetchmany(PROBE_BATCH_SIZE):
+                rows.extend(batch)
+        return rows
 
     assert len(select) == SELECT_COUNT  # type: ignore
 
-    cur.close()
-    conn.close()
-
 
 @pytest.mark.benchmark(group="relation")
-def test_uuidv4_pk_parent_child_insert(benchmark, postgres_url: str) -> None:
-    conn = psycopg2.connect(postgres_url)
-    cur = conn.cursor()
+def test_uuidv4_pk_parent_child_insert(benchmark, db) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT gen_random_uuid()")
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [
+            (_STRING_POOL[i & 1023], _STRING_POOL[i & 1023])
+            for i in range(INSERT_COUNT)
+        ]
+        return (rows,), {}
+
+    def insert(rows):
+        # Keep WAL fsync latency out of the timing; the transaction
+        # still commits atomically
+        cur.execute("SET LOCAL synchronous_commit = off;")
+        cur.executemany(
+            "WITH p AS (INSERT INTO parent (data) VALUES (%s) RETURNING id) "
+            "INSERT INTO child (parent_id, data) SELECT id, %s FROM p;",
+            rows,
+        )
+        conn.commit()
 
-    create_tables_with_uuidv4_pk(conn, cur)
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
 
-    @benchmark
-    def insert():
-        for i in range(INSERT_COUNT):
-            parent_id = str(uuid4())
-            cur.execute(
-                f"INSERT INTO parent (id, data) VALUES ('{parent_id}', '{generate_random_string()}');"
-            )
-            child_id = str(uuid4())
-            cur.execute(
-                f"INSERT INTO child (id, parent_id, data) VALUES ('{child_id}', '{parent_id}', '{generate_random_string()}');",
-            )
-        conn.commit()
 
-    cur.close()
-    conn.close()
+@pytest.mark.benchmark(group="concurrency")
+def test_serial_pk_concurrent_insert(benchmark, db, pool, workers) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "serial", ref_type="int")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def copy_chunk(rows):
+        with pool.connection() as worker_conn:
+            with worker_conn.cursor() as worker_cur:
+                worker_cur.execute("SET LOCAL synchronous_commit = off;")
+                with worker_cur.copy("COPY parent (data) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        chunks = [rows[i::workers] for i in range(workers)]
+        return (chunks,), {}
+
+    def insert(chunks):
+        list(executor.map(copy_chunk, chunks))
+
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
+
+    executor.shutdown()
+
+
+@pytest.mark.benchmark(group="concurrency")
+def test_bytea_ulid_pk_concurrent_insert(benchmark, db, pool, workers) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "BYTEA")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def copy_chunk(rows):
+        with pool.connection() as worker_conn:
+            with worker_conn.cursor() as worker_cur:
+                worker_cur.execute("SET LOCAL synchronous_commit = off;")
+                with worker_cur.copy("COPY parent (id, data) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+    def setup():
+        truncate_tables(conn, cur)
+        new_ids = bulk_ulid(INSERT_COUNT)
+        rows = [(new_ids[i], _STRING_POOL[i & 1023]) for i in range(INSERT_COUNT)]
+        chunks = [rows[i::workers] for i in range(workers)]
+        return (chunks,), {}
+
+    def insert(chunks):
+        list(executor.map(copy_chunk, chunks))
+
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
+
+    executor.shutdown()
+
+
+@pytest.mark.benchmark(group="concurrency")
+def test_uuid_uuidv7_pk_concurrent_insert(benchmark, db, pool, workers) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT uuidv7()")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def copy_chunk(rows):
+        with pool.connection() as worker_conn:
+            with worker_conn.cursor() as worker_cur:
+                worker_cur.execute("SET LOCAL synchronous_commit = off;")
+                with worker_cur.copy("COPY parent (data) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        chunks = [rows[i::workers] for i in range(workers)]
+        return (chunks,), {}
+
+    def insert(chunks):
+        list(executor.map(copy_chunk, chunks))
+
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
+
+    executor.shutdown()
+
+
+@pytest.mark.benchmark(group="concurrency")
+def test_uuid_uuidv4_pk_concurrent_insert(benchmark, db, pool, workers) -> None:
+    conn, cur = db
+
+    create_tables(conn, cur, "UUID", pk_default="DEFAULT gen_random_uuid()")
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def copy_chunk(rows):
+        with pool.connection() as worker_conn:
+            with worker_conn.cursor() as worker_cur:
+                worker_cur.execute("SET LOCAL synchronous_commit = off;")
+                with worker_cur.copy("COPY parent (data) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+
+    def setup():
+        truncate_tables(conn, cur)
+        rows = [(_STRING_POOL[i & 1023],) for i in range(INSERT_COUNT)]
+        chunks = [rows[i::workers] for i in range(workers)]
+        return (chunks,), {}
+
+    def insert(chunks):
+        list(executor.map(copy_chunk, chunks))
+
+    benchmark.pedantic(insert, setup=setup, rounds=BENCHMARK_ROUNDS)
+
+    executor.shutdown()